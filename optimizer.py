@@ -3,19 +3,195 @@ import asyncio
 import aiohttp
 import json
 import os
+import hashlib
+import threading
+import time
+import sqlite3
+from contextlib import closing
 import keyring
-from typing import List, Dict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Dict, Optional, Set, Tuple
+from urllib.parse import quote_plus
 from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, 
                               QHBoxLayout, QWidget, QTextEdit, QPushButton, 
                               QLabel, QProgressBar, QSplitter, QLineEdit,
                               QMessageBox, QScrollArea)
-from PySide6.QtCore import QThread, Signal, Qt, QUrl
-from PySide6.QtGui import QFont, QDesktopServices, QPixmap, QPainter, QPen, QFontDatabase
+from PySide6.QtCore import QThread, Signal, Qt, QUrl, QObject, QRunnable, QThreadPool
+from PySide6.QtGui import QFont, QDesktopServices, QPixmap, QPainter, QPen, QFontDatabase, QAction, QTextCursor
 from PySide6.QtSvg import QSvgRenderer
-import requests
-from bs4 import BeautifulSoup
+import httpx
+import lxml.html
+from lxml import etree
+from ddgs import DDGS
+from ddgs.exceptions import DDGSException
 import re
 
+# On-disk caches for search terms, search results and optimized texts
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "seo_optimizer")
+CACHE_EXPIRE_AFTER = 3600  # seconds
+
+# Only this many search results are sent to Claude
+MAX_SEARCH_RESULTS = 20
+
+# Number of search terms looked up at the same time
+SEARCH_CONCURRENCY = 4
+
+# Results sit near the top of the page, so there is no need to download past this
+MAX_SEARCH_PAGE_BYTES = 128 * 1024
+
+# Compiled once; selects the first result blocks and their title/snippet links
+RESULT_XPATH = etree.XPath(
+    '(.//div[contains(concat(" ", normalize-space(@class), " "), " result ")])[position() <= 5]')
+TITLE_XPATH = etree.XPath('.//a[contains(concat(" ", normalize-space(@class), " "), " result__a ")]')
+SNIPPET_XPATH = etree.XPath('.//a[contains(concat(" ", normalize-space(@class), " "), " result__snippet ")]')
+
+EXTRACT_PROMPT_TMPL = """
+Analyze the following text and extract 5-10 relevant search terms that would help with SEO optimization. 
+Focus on key topics, important keywords, and phrases that people might search for.
+Return only the search terms, one per line, without numbering or explanation.
+
+Text: {text}
+"""
+
+OPTIMIZE_PROMPT_TMPL = """
+Please optimize the following text for SEO based on the search results provided. 
+Use the titles and descriptions as reference to understand what content performs well for related topics.
+
+Improve the text by:
+1. Adding relevant keywords naturally
+2. Improving readability and structure
+3. Making it more engaging
+4. Ensuring it addresses topics that appear frequently in the search results
+
+Keep the core message and style intact while making it more SEO-friendly. Keep the word count almost same plus or minus a few words. Create a few variations of the SEO optimised text.
+
+Original Text:
+{original_text}
+
+Search Results for Reference:
+{search_context}
+
+Output just the optimised texts, do not output anything else.
+"""
+
+# Dark theme stylesheet; {font} is replaced with the UI font family
+_STYLE_TMPL = """
+QMainWindow {{
+    background-color: #1e1e1e;
+    color: #ffffff;
+}}
+QWidget {{
+    background-color: #1e1e1e;
+    color: #ffffff;
+}}
+QLabel[objectName="title"] {{
+    color: #FFFFFF;
+    font-weight: bold;
+    margin-left: 15px;
+}}
+QTextEdit {{
+    background-color: #2d2d2d;
+    border-radius: 8px;
+    padding: 15px;
+    font-size: 13px;
+    font-family: '{font}';
+    color: #ffffff;
+    selection-background-color: #4A9EFF;
+    selection-color: #ffffff;
+}}
+QTextEdit:focus {{
+    border: 1px solid #66B3FF;
+    background-color: #333333;
+}}
+QPushButton {{
+    background-color: #4A9EFF;
+    color: #ffffff;
+    border: none;
+    padding: 12px 24px;
+    font-size: 14px;
+    font-family: '{font}';
+    border-radius: 6px;
+    font-weight: bold;
+    min-height: 20px;
+}}
+QPushButton:hover {{
+    background-color: #66B3FF;
+}}
+QPushButton:pressed {{
+    background-color: #3385FF;
+}}
+QPushButton:disabled {{
+    background-color: #555555;
+    color: #888888;
+}}
+QPushButton[objectName="small_button"] {{
+    max-width: 100px;
+    padding: 8px 16px;
+    font-size: 12px;
+    min-height: 16px;
+}}
+QLabel {{
+    color: #ffffff;
+    font-weight: 500;
+    font-size: 13px;
+    font-family: '{font}';
+}}
+QLineEdit {{
+    background-color: #2d2d2d;
+    border-radius: 6px;
+    padding: 10px;
+    font-size: 13px;
+    font-family: '{font}';
+    color: #ffffff;
+    selection-background-color: #4A9EFF;
+    selection-color: #ffffff;
+}}
+QLineEdit:focus {{
+    border: 1px solid #66B3FF;
+    background-color: #333333;
+}}
+QProgressBar {{
+    background-color: #2d2d2d;
+    border: 1px solid #4A9EFF;
+    border-radius: 4px;
+    text-align: center;
+    color: #ffffff;
+    font-weight: bold;
+}}
+QProgressBar::chunk {{
+    background-color: #4A9EFF;
+    border-radius: 3px;
+}}
+QSplitter::handle {{
+    background-color: transparent;
+    width: 3px;
+}}
+QSplitter::handle:hover {{
+    background-color: transparent;
+}}
+QMessageBox {{
+    background-color: #2d2d2d;
+    color: #ffffff;
+}}
+QSvgWidget {{
+    background: transparent;
+}}
+QSvgWidget:hover {{
+    opacity: 0.8;
+}}
+QMenuBar::item:selected {{
+    background-color: #2d2d2d;
+}}
+QMenu::item:selected {{
+    background-color: #4A9EFF;
+}}
+QMessageBox QPushButton {{
+    background-color: #4A9EFF;
+    min-width: 80px;
+}}
+"""
+
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
     try:
@@ -38,7 +214,47 @@ def get_resource_path(relative_path):
     
     return os.path.join(base_path, relative_path)
 
+class JsonCache:
+    """Small SQLite key/value store for JSON values that expire after CACHE_EXPIRE_AFTER"""
+    def __init__(self, name: str):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        self.path = os.path.join(CACHE_DIR, f"{name}.sqlite")
+        with self._connect() as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS cache "
+                         "(key TEXT PRIMARY KEY, value TEXT, created REAL)")
+    
+    def _connect(self):
+        # A fresh connection per call keeps the store safe to use from any thread
+        return closing(sqlite3.connect(self.path, timeout=5))
+    
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return None if entry is None else entry[1]
+    
+    def get_entry(self, key: str) -> Optional[Tuple[float, Any]]:
+        """Return (created, value) for an unexpired key"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created FROM cache WHERE key = ?", (key,)).fetchone()
+        
+        if row is None or time.time() - row[1] > CACHE_EXPIRE_AFTER:
+            return None
+        return row[1], json.loads(row[0])
+    
+    def set(self, key: str, value: Any):
+        now = time.time()
+        with self._connect() as conn, conn:
+            # Prune on write so expired entries don't pile up on disk
+            conn.execute("DELETE FROM cache WHERE created < ?", (now - CACHE_EXPIRE_AFTER,))
+            conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                         (key, json.dumps(value), now))
+    
+    def clear(self):
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM cache")
+
 class SearchResult:
+    __slots__ = ('title', 'description', 'url')
+    
     def __init__(self, title: str, description: str, url: str = ""):
         self.title = title
         self.description = description
@@ -46,49 +262,110 @@ class SearchResult:
 
 class SEOWorkerThread(QThread):
     progress_updated = Signal(str)
+    chunk_ready = Signal(str)
     finished = Signal(str)
     error_occurred = Signal(str)
     
+    # (created, search terms) from previous runs, keyed by a hash of the input text
+    _terms_cache: Dict[str, Tuple[float, List[str]]] = {}
+    _terms_cache_size = 64
+    
     def __init__(self, text: str, claude_api_key: str):
         super().__init__()
         self.text = text
         self.claude_api_key = claude_api_key
         self.search_results: List[SearchResult] = []
+        self.seen_urls: Set[str] = set()
+        self._cancel = threading.Event()
+        self.results_cache = JsonCache("results_cache")
+        self.terms_store = JsonCache("terms_cache")
+        self.optimize_store = JsonCache("optimize_cache")
+        
+        # HTTP/2 client so both Claude calls share one connection and compressed headers
+        self.http = httpx.Client(http2=True, timeout=60.0, headers=self.claude_headers())
     
     def run(self):
         try:
             # Step 1: Extract search terms using Claude
             self.progress_updated.emit("Extracting search terms using Claude...")
-            search_terms = self.extract_search_terms(self.text)
+            search_terms = self.wait_for_call(self.extract_search_terms, self.text)
+            if self._cancel.is_set():
+                return
             
             # Step 2: Perform Google searches
             self.progress_updated.emit("Performing Google searches...")
             self.perform_searches(search_terms)
+            if self._cancel.is_set():
+                return
             
             # Step 3: SEO optimize using Claude
             self.progress_updated.emit("Optimizing content with Claude...")
-            optimized_text = self.seo_optimize_text(self.text, self.search_results)
+            optimized_text = self.wait_for_call(self.seo_optimize_text, self.text, self.search_results)
+            if self._cancel.is_set():
+                return
             
             self.finished.emit(optimized_text)
             
         except Exception as e:
-            self.error_occurred.emit(str(e))
+            # Errors from requests aborted by cancel() are expected
+            if not self._cancel.is_set():
+                self.error_occurred.emit(str(e))
+        finally:
+            self.http.close()
     
-    def extract_search_terms(self, text: str) -> List[str]:
-        """Use Claude API to extract relevant search terms from text"""
-        headers = {
+    def cancel(self):
+        """Ask the worker to stop and abort its Claude requests"""
+        self._cancel.set()
+        self.http.close()
+    
+    def wait_for_call(self, fn, *args):
+        """Run a blocking Claude call on a daemon thread so cancel() never waits for it"""
+        outcome = {}
+        
+        def target():
+            try:
+                outcome['result'] = fn(*args)
+            except Exception as e:
+                outcome['error'] = e
+        
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        
+        # Closing the client does not interrupt a blocked read, so stop waiting instead
+        while thread.is_alive() and not self._cancel.wait(0.1):
+            pass
+        
+        if self._cancel.is_set():
+            return None
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['result']
+    
+    def claude_headers(self) -> Dict[str, str]:
+        """Build the request headers for the Claude API"""
+        return {
             'Content-Type': 'application/json',
             'X-API-Key': self.claude_api_key,
             'anthropic-version': '2023-06-01'
         }
+    
+    def extract_search_terms(self, text: str) -> List[str]:
+        """Use Claude API to extract relevant search terms from text"""
+        cache_key = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        entry = self._terms_cache.pop(cache_key, None)
+        if entry is not None and time.time() - entry[0] <= CACHE_EXPIRE_AFTER:
+            # Re-insert so the most recently used entries are evicted last
+            self._terms_cache[cache_key] = entry
+            return list(entry[1])
         
-        prompt = f"""
-        Analyze the following text and extract 5-10 relevant search terms that would help with SEO optimization. 
-        Focus on key topics, important keywords, and phrases that people might search for.
-        Return only the search terms, one per line, without numbering or explanation.
+        # Fall back to terms persisted by earlier sessions
+        entry = self.terms_store.get_entry(cache_key)
+        if entry is not None:
+            created, search_terms = entry
+            self.remember_terms(cache_key, search_terms, created)
+            return search_terms
         
-        Text: {text}
-        """
+        prompt = EXTRACT_PROMPT_TMPL.format(text=text)
         
         data = {
             'model': 'claude-3-5-sonnet-20241022',
@@ -98,105 +375,268 @@ class SEOWorkerThread(QThread):
             ]
         }
         
-        response = requests.post('https://api.anthropic.com/v1/messages', 
-                               headers=headers, json=data)
+        response = self.http.post('https://api.anthropic.com/v1/messages', json=data)
         
         if response.status_code == 200:
             result = response.json()
             content = result['content'][0]['text']
             search_terms = [term.strip() for term in content.split('\n') if term.strip()]
-            return search_terms[:10]  # Limit to 10 terms
+            search_terms = search_terms[:10]  # Limit to 10 terms
+            
+            self.terms_store.set(cache_key, search_terms)
+            self.remember_terms(cache_key, search_terms, time.time())
+            return search_terms
         else:
             raise Exception(f"Claude API error: {response.status_code} - {response.text}")
     
+    def remember_terms(self, cache_key: str, search_terms: List[str], created: float):
+        """Keep search terms in the in-process cache until they expire"""
+        # Evict the least recently used entry once the cache is full
+        if len(self._terms_cache) >= self._terms_cache_size:
+            del self._terms_cache[next(iter(self._terms_cache))]
+        self._terms_cache[cache_key] = (created, list(search_terms))
+    
     def perform_searches(self, search_terms: List[str]):
-        """Perform Google searches and extract titles/descriptions"""
+        """Perform searches concurrently, in term order, until enough results are found"""
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         
-        for term in search_terms:
-            try:
-                self.progress_updated.emit(f"Searching for: {term}")
+        async def search_all():
+            connector = aiohttp.TCPConnector(limit=16)
+            async with aiohttp.ClientSession(headers=headers, connector=connector) as session:
+                # Keep a few searches running and collect them in term order, so terms
+                # after the result limit is reached are never searched
+                pending_terms = iter(search_terms)
+                in_flight = deque()
                 
-                # Use DuckDuckGo as it's more scraping-friendly than Google
-                search_url = f"https://duckduckgo.com/html/?q={term.replace(' ', '+')}"
-                response = requests.get(search_url, headers=headers, timeout=10)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Extract search results
-                    results = soup.find_all('div', class_='result')[:5]  # First 5 results
+                def start_searches():
+                    # Finished searches waiting behind a slower earlier term don't count
+                    # as running, but hold off if their results alone would fill the list
+                    finished = [task for _, task in in_flight if task.done()]
+                    buffered = sum(len(task.result()) for task in finished
+                                   if not task.cancelled() and task.exception() is None)
+                    if len(self.search_results) + buffered >= MAX_SEARCH_RESULTS:
+                        return
                     
-                    for result in results:
-                        title_elem = result.find('a', class_='result__a')
-                        snippet_elem = result.find('a', class_='result__snippet')
-                        
-                        if title_elem and snippet_elem:
-                            title = title_elem.get_text(strip=True)
-                            description = snippet_elem.get_text(strip=True)
-                            url = title_elem.get('href', '')
-                            
-                            self.search_results.append(SearchResult(title, description, url))
+                    running = len(in_flight) - len(finished)
+                    while running < SEARCH_CONCURRENCY:
+                        term = next(pending_terms, None)
+                        if term is None:
+                            return
+                        in_flight.append((term, asyncio.ensure_future(self._search(session, term))))
+                        running += 1
                 
-            except Exception as e:
-                self.progress_updated.emit(f"Search error for '{term}': {str(e)}")
-                continue
+                try:
+                    while True:
+                        while in_flight and in_flight[0][1].done():
+                            term, task = in_flight.popleft()
+                            try:
+                                self.add_search_results(task.result())
+                            except Exception as e:
+                                self.progress_updated.emit(f"Search error for '{term}': {str(e)}")
+                        
+                        if len(self.search_results) >= MAX_SEARCH_RESULTS or self._cancel.is_set():
+                            break
+                        start_searches()
+                        if not in_flight:
+                            break
+                        
+                        # Wake up when any search finishes, polling so a cancel request
+                        # doesn't wait for a slow search
+                        running = [task for _, task in in_flight if not task.done()]
+                        await asyncio.wait(running, timeout=0.1, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    # Drop searches whose results are no longer needed
+                    for _, task in in_flight:
+                        task.cancel()
+                    await asyncio.gather(*[task for _, task in in_flight], return_exceptions=True)
+        
+        # ddgs calls block, so they get their own pool that can be abandoned on cancel;
+        # asyncio.run would wait for the default executor's threads to finish
+        self.search_executor = ThreadPoolExecutor(max_workers=SEARCH_CONCURRENCY)
+        try:
+            # One client for every term, so its engines and connections are reused
+            with DDGS() as self.ddgs:
+                # QThread has no event loop of its own, so run one just for the searches
+                asyncio.run(search_all())
+        finally:
+            self.search_executor.shutdown(wait=False, cancel_futures=True)
     
-    def seo_optimize_text(self, original_text: str, search_results: List[SearchResult]) -> str:
-        """Use Claude to optimize text based on search results"""
-        headers = {
-            'Content-Type': 'application/json',
-            'X-API-Key': self.claude_api_key,
-            'anthropic-version': '2023-06-01'
-        }
+    def add_search_results(self, results: List[SearchResult]):
+        """Add new results until MAX_SEARCH_RESULTS is reached"""
+        for result in results:
+            if len(self.search_results) >= MAX_SEARCH_RESULTS:
+                return
+            
+            # Overlapping terms often return the same page; send it to Claude once
+            if result.url:
+                if result.url in self.seen_urls:
+                    continue
+                self.seen_urls.add(result.url)
+            
+            self.search_results.append(result)
+    
+    async def _search(self, session: aiohttp.ClientSession, term: str) -> List[SearchResult]:
+        """Search DuckDuckGo for a single term"""
+        cached = self.results_cache.get(term)
+        if cached is not None:
+            return [SearchResult(*result) for result in cached]
         
-        # Prepare search results context
-        search_context = "\n".join([
-            f"Title: {result.title}\nDescription: {result.description}\n"
-            for result in search_results[:20]  # Limit context size
-        ])
+        self.progress_updated.emit(f"Searching for: {term}")
         
-        prompt = f"""
-        Please optimize the following text for SEO based on the search results provided. 
-        Use the titles and descriptions as reference to understand what content performs well for related topics.
+        try:
+            # The ddgs client is blocking, so keep it off the event loop
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self.search_executor, self._ddgs_search, term)
+        except DDGSException:
+            # ddgs already queried the HTML endpoint, so scraping it again won't help
+            raise
+        except Exception:
+            # Fall back to scraping the HTML results page if the client itself broke
+            content = await self._fetch(session, term)
+            if content is None:
+                return []
+            results = self._parse_results(content)
+        
+        # Empty pages are usually a rate-limit block, so don't keep them around
+        if results:
+            self.results_cache.set(term, [[r.title, r.description, r.url] for r in results])
+        return results
+    
+    def _ddgs_search(self, term: str) -> List[SearchResult]:
+        """Fetch the first results for a term through the ddgs client"""
+        results = self.ddgs.text(term, max_results=5, backend='duckduckgo')
+        return [SearchResult(r['title'], r['body'], r['href']) for r in results]
+    
+    async def _fetch(self, session: aiohttp.ClientSession, term: str) -> Optional[bytes]:
+        """Fetch the DuckDuckGo results page for a single search term"""
+        # Use DuckDuckGo as it's more scraping-friendly than Google
+        search_url = f"https://duckduckgo.com/html/?q={quote_plus(term)}"
+        async with session.get(search_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status != 200:
+                return None
+            # Read from the stream so the rest of the page is never downloaded;
+            # parsed results are cached by term, not the raw page
+            try:
+                return await response.content.readexactly(MAX_SEARCH_PAGE_BYTES)
+            except asyncio.IncompleteReadError as e:
+                # Page is smaller than the cap
+                return e.partial
+    
+    def _parse_results(self, content: bytes) -> List[SearchResult]:
+        """Extract titles/descriptions from a DuckDuckGo HTML results page"""
+        if not content:
+            return []
         
-        Improve the text by:
-        1. Adding relevant keywords naturally
-        2. Improving readability and structure
-        3. Making it more engaging
-        4. Ensuring it addresses topics that appear frequently in the search results
+        tree = lxml.html.fromstring(content)
+        search_results = []
         
-        Keep the core message and style intact while making it more SEO-friendly. Keep the word count almost same plus or minus a few words. Create a few variations of the SEO optimised text.
+        for result in RESULT_XPATH(tree):  # First 5 results
+            title_elems = TITLE_XPATH(result)
+            snippet_elems = SNIPPET_XPATH(result)
+            
+            if title_elems and snippet_elems:
+                title = " ".join(title_elems[0].text_content().split())
+                description = " ".join(snippet_elems[0].text_content().split())
+                url = title_elems[0].get('href', '')
+                
+                search_results.append(SearchResult(title, description, url))
         
-        Original Text:
-        {original_text}
+        return search_results
+    
+    def seo_optimize_text(self, original_text: str, search_results: List[SearchResult]) -> str:
+        """Use Claude to optimize text based on search results"""
+        # Prepare search results context
+        search_context = "\n".join(
+            f"Title: {result.title}\nDescription: {result.description}\n"
+            for result in search_results[:MAX_SEARCH_RESULTS]  # Limit context size
+        )
         
-        Search Results for Reference:
-        {search_context}
+        prompt = OPTIMIZE_PROMPT_TMPL.format(original_text=original_text,
+                                            search_context=search_context)
         
-        Output just the optimised texts, do not output anything else.
-        """
+        # The same text and results give the same prompt; replay the earlier answer
+        cache_key = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+        optimized_text = self.optimize_store.get(cache_key)
+        if optimized_text is not None:
+            self.chunk_ready.emit(optimized_text)
+            return optimized_text
         
         data = {
             'model': 'claude-3-5-sonnet-20241022',
             'max_tokens': 2000,
+            'stream': True,
             'messages': [
                 {'role': 'user', 'content': prompt}
             ]
         }
         
-        response = requests.post('https://api.anthropic.com/v1/messages', 
-                               headers=headers, json=data)
+        # Stream the answer so the UI can show text as soon as Claude produces it
+        chunks = []
+        with self.http.stream('POST', 'https://api.anthropic.com/v1/messages', json=data) as response:
+            if response.status_code != 200:
+                response.read()
+                raise Exception(f"Claude API error: {response.status_code} - {response.text}")
+            
+            for line in response.iter_lines():
+                # Leaving the block closes the stream, which stops generation
+                if self._cancel.is_set():
+                    break
+                if not line.startswith('data:'):
+                    continue
+                
+                event = json.loads(line[len('data:'):])
+                if event['type'] == 'content_block_delta' and event['delta']['type'] == 'text_delta':
+                    chunks.append(event['delta']['text'])
+                    self.chunk_ready.emit(event['delta']['text'])
+                elif event['type'] == 'error':
+                    raise Exception(f"Claude API error: {event['error']['message']}")
         
-        if response.status_code == 200:
-            result = response.json()
-            return result['content'][0]['text']
-        else:
-            raise Exception(f"Claude API error: {response.status_code} - {response.text}")
+        optimized_text = "".join(chunks)
+        # A cancelled stream is only part of the answer, so don't keep it
+        if optimized_text and not self._cancel.is_set():
+            self.optimize_store.set(cache_key, optimized_text)
+        return optimized_text
+
+class _KeyringSignals(QObject):
+    loaded = Signal(str, bool)
+    load_failed = Signal(str, bool)
+    saved = Signal()
+    save_failed = Signal(str)
+
+class _KeyringLoader(QRunnable):
+    """Load the saved API key from the system keyring on a pool thread"""
+    def __init__(self, show_message: bool):
+        super().__init__()
+        self.show_message = show_message
+        self.signals = _KeyringSignals()
+    
+    def run(self):
+        try:
+            api_key = keyring.get_password("seo_optimizer", "claude_api_key")
+            self.signals.loaded.emit(api_key or "", self.show_message)
+        except Exception as e:
+            self.signals.load_failed.emit(str(e), self.show_message)
+
+class _KeyringSaver(QRunnable):
+    """Save the API key to the system keyring on a pool thread"""
+    def __init__(self, api_key: str):
+        super().__init__()
+        self.api_key = api_key
+        self.signals = _KeyringSignals()
+    
+    def run(self):
+        try:
+            keyring.set_password("seo_optimizer", "claude_api_key", self.api_key)
+            self.signals.saved.emit()
+        except Exception as e:
+            self.signals.save_failed.emit(str(e))
 
 class SEOOptimizerApp(QMainWindow):
+    # Rendered SVGs, keyed by (path, width, height, device pixel ratio)
+    _svg_cache: Dict[tuple, QPixmap] = {}
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("SEO Optimizer with Claude API")
@@ -204,8 +644,12 @@ class SEOOptimizerApp(QMainWindow):
         
         # Load custom fonts
         self.load_custom_fonts()
+        self._font_family = self.get_font_family()
+        
+        self.worker = None
         
         self.setup_ui()
+        self.setup_menu()
         
     def setup_ui(self):
         central_widget = QWidget()
@@ -238,7 +682,7 @@ class SEOOptimizerApp(QMainWindow):
         # Title with tighter spacing
         title_label = QLabel("SEO Optimiser from day-dream")
         title_label.setObjectName("title")
-        title_label.setFont(QFont(self.get_font_family(), 18, QFont.Bold))
+        title_label.setFont(QFont(self._font_family, 18, QFont.Bold))
         title_label.setContentsMargins(0, 0, 0, 0)  # Remove margins
         header_layout.addWidget(title_label)
         
@@ -319,122 +763,26 @@ class SEOOptimizerApp(QMainWindow):
         layout.addWidget(splitter)
         
         # Style the interface with dark theme
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #1e1e1e;
-                color: #ffffff;
-            }
-            QWidget {
-                background-color: #1e1e1e;
-                color: #ffffff;
-            }
-            QLabel[objectName="title"] {
-                color: #FFFFFF;
-                font-weight: bold;
-                margin-left: 15px;
-            }
-            QTextEdit {
-                background-color: #2d2d2d;
-                border-radius: 8px;
-                padding: 15px;
-                font-size: 13px;
-                font-family: '""" + self.get_font_family() + """';
-                color: #ffffff;
-                selection-background-color: #4A9EFF;
-                selection-color: #ffffff;
-            }
-            QTextEdit:focus {
-                border: 1px solid #66B3FF;
-                background-color: #333333;
-            }
-            QPushButton {
-                background-color: #4A9EFF;
-                color: #ffffff;
-                border: none;
-                padding: 12px 24px;
-                font-size: 14px;
-                font-family: '""" + self.get_font_family() + """';
-                border-radius: 6px;
-                font-weight: bold;
-                min-height: 20px;
-            }
-            QPushButton:hover {
-                background-color: #66B3FF;
-            }
-            QPushButton:pressed {
-                background-color: #3385FF;
-            }
-            QPushButton:disabled {
-                background-color: #555555;
-                color: #888888;
-            }
-            QPushButton[objectName="small_button"] {
-                max-width: 100px;
-                padding: 8px 16px;
-                font-size: 12px;
-                min-height: 16px;
-            }
-            QLabel {
-                color: #ffffff;
-                font-weight: 500;
-                font-size: 13px;
-                font-family: '""" + self.get_font_family() + """';
-            }
-            QLineEdit {
-                background-color: #2d2d2d;
-                border-radius: 6px;
-                padding: 10px;
-                font-size: 13px;
-                font-family: '""" + self.get_font_family() + """';
-                color: #ffffff;
-                selection-background-color: #4A9EFF;
-                selection-color: #ffffff;
-            }
-            QLineEdit:focus {
-                border: 1px solid #66B3FF;
-                background-color: #333333;
-            }
-            QProgressBar {
-                background-color: #2d2d2d;
-                border: 1px solid #4A9EFF;
-                border-radius: 4px;
-                text-align: center;
-                color: #ffffff;
-                font-weight: bold;
-            }
-            QProgressBar::chunk {
-                background-color: #4A9EFF;
-                border-radius: 3px;
-            }
-            QSplitter::handle {
-                background-color: transparent;
-                width: 3px;
-            }
-            QSplitter::handle:hover {
-                background-color: transparent;
-            }
-            QMessageBox {
-                background-color: #2d2d2d;
-                color: #ffffff;
-            }
-            QSvgWidget {
-                background: transparent;
-            }
-            QSvgWidget:hover {
-                opacity: 0.8;
-            }
-            QMessageBox QPushButton {
-                background-color: #4A9EFF;
-                min-width: 80px;
-            }
-        """)
+        self.setStyleSheet(_STYLE_TMPL.format(font=self._font_family))
     
         # Set object names for styling
         self.save_key_btn.setObjectName("small_button")
         self.load_key_btn.setObjectName("small_button")
     
+    def setup_menu(self):
+        file_menu = self.menuBar().addMenu("File")
+        
+        clear_cache_action = QAction("Clear Cache", self)
+        clear_cache_action.triggered.connect(self.clear_cache)
+        file_menu.addAction(clear_cache_action)
+    
     def load_svg_as_pixmap(self, svg_path: str, width: int, height: int) -> QPixmap:
         """Load SVG file and render it as a QPixmap"""
+        device_pixel_ratio = self.devicePixelRatioF()
+        cache_key = (svg_path, width, height, device_pixel_ratio)
+        if cache_key in self._svg_cache:
+            return self._svg_cache[cache_key]
+        
         try:
             if not os.path.exists(svg_path):
                 print(f"SVG file not found: {svg_path}")
@@ -445,13 +793,16 @@ class SEOOptimizerApp(QMainWindow):
                 print(f"Invalid SVG file: {svg_path}")
                 return None
             
-            pixmap = QPixmap(width, height)
+            # Render at physical pixel size so the logo stays sharp on high DPI screens
+            pixmap = QPixmap(round(width * device_pixel_ratio), round(height * device_pixel_ratio))
             pixmap.fill(Qt.transparent)
             
             painter = QPainter(pixmap)
             renderer.render(painter)
             painter.end()
             
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+            self._svg_cache[cache_key] = pixmap
             return pixmap
             
         except Exception as e:
@@ -492,13 +843,10 @@ class SEOOptimizerApp(QMainWindow):
             "Arial",           # Universal fallback
         ]
         
-        available_fonts = QFontDatabase.families()
-        
-        for font in preferred_fonts:
-            if font in available_fonts:
-                return font
+        available_fonts = set(QFontDatabase.families())
         
-        return "Arial"  # Ultimate fallback
+        return next((font for font in preferred_fonts if font in available_fonts),
+                    "Arial")  # Ultimate fallback
     
     def get_font_family(self):
         """Get the current font family"""
@@ -520,7 +868,7 @@ class SEOOptimizerApp(QMainWindow):
         # Draw "DD" text with custom font
         painter.setPen(Qt.white)
         font_size = max(size // 3, 12)
-        painter.setFont(QFont(self.get_font_family(), font_size, QFont.Bold))
+        painter.setFont(QFont(self._font_family, font_size, QFont.Bold))
         painter.drawText(pixmap.rect(), Qt.AlignCenter, "DD")
         
         painter.end()
@@ -534,59 +882,87 @@ class SEOOptimizerApp(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please enter an API key before saving.")
             return
         
-        try:
-            # Save to system keyring
-            keyring.set_password("seo_optimizer", "claude_api_key", api_key)
-            QMessageBox.information(self, "Success", "API key saved securely!")
+        # Keyring backends can block while the wallet unlocks, so save off the UI thread
+        self.save_key_btn.setEnabled(False)
+        saver = _KeyringSaver(api_key)
+        saver.signals.saved.connect(self.api_key_saved)
+        saver.signals.save_failed.connect(self.api_key_save_failed)
+        QThreadPool.globalInstance().start(saver)
+    
+    def api_key_saved(self):
+        QMessageBox.information(self, "Success", "API key saved securely!")
+        
+        # Update button text temporarily
+        original_text = self.save_key_btn.text()
+        self.save_key_btn.setText("Saved ✓")
+        
+        # Reset button after 2 seconds
+        def reset_button():
+            self.save_key_btn.setText(original_text)
+            self.save_key_btn.setEnabled(True)
+        
+        # Use QTimer for the reset
+        from PySide6.QtCore import QTimer
+        QTimer.singleShot(2000, reset_button)
+    
+    def api_key_save_failed(self, error_message: str):
+        self.save_key_btn.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Failed to save API key:\n{error_message}")
+    
+    def load_api_key(self, show_message=True):
+        """Load API key securely from keyring"""
+        # Keyring backends can block while the wallet unlocks, so load off the UI thread
+        self.load_key_btn.setEnabled(False)
+        loader = _KeyringLoader(show_message)
+        loader.signals.loaded.connect(self.api_key_loaded)
+        loader.signals.load_failed.connect(self.api_key_load_failed)
+        QThreadPool.globalInstance().start(loader)
+    
+    def api_key_loaded(self, api_key: str, show_message: bool):
+        if not show_message and self.api_key_input.text():
+            # A key was typed before the startup load finished; don't overwrite it
+            self.load_key_btn.setEnabled(True)
+            return
+        
+        if api_key:
+            self.api_key_input.setText(api_key)
+            if show_message:
+                QMessageBox.information(self, "Success", "API key loaded successfully!")
             
             # Update button text temporarily
-            original_text = self.save_key_btn.text()
-            self.save_key_btn.setText("Saved ✓")
-            self.save_key_btn.setEnabled(False)
+            original_text = self.load_key_btn.text()
+            self.load_key_btn.setText("Loaded ✓")
             
             # Reset button after 2 seconds
             def reset_button():
-                self.save_key_btn.setText(original_text)
-                self.save_key_btn.setEnabled(True)
+                self.load_key_btn.setText(original_text)
+                self.load_key_btn.setEnabled(True)
             
-            # Use QTimer for the reset
             from PySide6.QtCore import QTimer
             QTimer.singleShot(2000, reset_button)
             
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save API key:\n{str(e)}")
+        else:
+            self.load_key_btn.setEnabled(True)
+            if show_message:
+                QMessageBox.information(self, "Info", "No saved API key found.")
     
-    def load_api_key(self, show_message=True):
-        """Load API key securely from keyring"""
+    def api_key_load_failed(self, error_message: str, show_message: bool):
+        self.load_key_btn.setEnabled(True)
+        if show_message:
+            QMessageBox.critical(self, "Error", f"Failed to load API key:\n{error_message}")
+    
+    def clear_cache(self):
+        """Remove all cached search terms, search results and optimized texts"""
         try:
-            # Load from system keyring
-            api_key = keyring.get_password("seo_optimizer", "claude_api_key")
+            SEOWorkerThread._terms_cache.clear()
+            JsonCache("terms_cache").clear()
+            JsonCache("results_cache").clear()
+            JsonCache("optimize_cache").clear()
+            
+            QMessageBox.information(self, "Success", "Cache cleared!")
             
-            if api_key:
-                self.api_key_input.setText(api_key)
-                if show_message:
-                    QMessageBox.information(self, "Success", "API key loaded successfully!")
-                
-                # Update button text temporarily
-                original_text = self.load_key_btn.text()
-                self.load_key_btn.setText("Loaded ✓")
-                self.load_key_btn.setEnabled(False)
-                
-                # Reset button after 2 seconds
-                def reset_button():
-                    self.load_key_btn.setText(original_text)
-                    self.load_key_btn.setEnabled(True)
-                
-                from PySide6.QtCore import QTimer
-                QTimer.singleShot(2000, reset_button)
-                
-            else:
-                if show_message:
-                    QMessageBox.information(self, "Info", "No saved API key found.")
-                    
         except Exception as e:
-            if show_message:
-                QMessageBox.critical(self, "Error", f"Failed to load API key:\n{str(e)}")
+            QMessageBox.critical(self, "Error", f"Failed to clear cache:\n{str(e)}")
     
     def start_processing(self):
         text = self.input_text.toPlainText().strip()
@@ -609,6 +985,7 @@ class SEOOptimizerApp(QMainWindow):
         # Start worker thread
         self.worker = SEOWorkerThread(text, api_key)
         self.worker.progress_updated.connect(self.update_status)
+        self.worker.chunk_ready.connect(self.append_output)
         self.worker.finished.connect(self.processing_finished)
         self.worker.error_occurred.connect(self.processing_error)
         self.worker.start()
@@ -616,8 +993,15 @@ class SEOOptimizerApp(QMainWindow):
     def update_status(self, message: str):
         self.status_label.setText(message)
     
+    def append_output(self, text: str):
+        # Always append at the end, even if the user clicked inside the output
+        self.output_text.moveCursor(QTextCursor.End)
+        self.output_text.insertPlainText(text)
+    
     def processing_finished(self, optimized_text: str):
-        self.output_text.setPlainText(optimized_text)
+        # The text has normally been streamed in already
+        if self.output_text.toPlainText() != optimized_text:
+            self.output_text.setPlainText(optimized_text)
         self.status_label.setText("Optimization completed successfully!")
         self.reset_ui()
     
@@ -629,6 +1013,18 @@ class SEOOptimizerApp(QMainWindow):
     def reset_ui(self):
         self.process_btn.setEnabled(True)
         self.progress_bar.setVisible(False)
+    
+    def closeEvent(self, event):
+        # Stop a running optimization instead of letting it spend API calls
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            if not self.worker.wait(2000):
+                # Destroying a running QThread aborts the app, so let it finish
+                self.worker.wait()
+        
+        # Let in-flight keyring reads/writes finish before the app tears down
+        QThreadPool.globalInstance().waitForDone(2000)
+        super().closeEvent(event)
 
 def main():
     # Enable high DPI scaling and font antialiasing